@@ -99,6 +99,14 @@ class Character:
     # Good characters who lie about themselves and their info (e.g., Drunk)
     lies_about_character_and_info: ClassVar[bool] = False
 
+    # Characters that can hold other abilities (see walk_ability_tree) or think
+    # they are another character, so need more than an isinstance check to see
+    # what they act like
+    wraps_abilities: ClassVar[bool] = False
+
+    # Set on instances of minions killed by a Vigormortis
+    vigormortised: ClassVar[bool] = False
+
     effects_active: bool = False
 
     # Night the character was created, usually 1
@@ -218,7 +226,7 @@ class Character:
         if (
             not self.effects_active
             and not self.is_droisoned(state, me)
-            and (not player.is_dead or player.vigormortised)
+            and (not player.is_dead or player.character.vigormortised)
         ):
             self.effects_active = True
             self._activate_effects_impl(state, me)
@@ -233,7 +241,7 @@ class Character:
         Will be called on any character at the moment they are poisoned, killed,
         or changed into another character.
         """
-        if reason is Reason.DEATH and state.players[me].vigormortised:
+        if reason is Reason.DEATH and state.players[me].character.vigormortised:
             return
         if self.effects_active:
             self.effects_active = False
@@ -376,6 +384,8 @@ class Character:
         Like 'has_ability', but also returns True on characters that think they
         have the queried ability.
         """
+        if not self.wraps_abilities:
+            return isinstance(self, character)
         return (
             any(
                 isinstance(ability, character)
@@ -684,15 +694,17 @@ class Boffin(Minion):
             ability = ability_t()
             ability.ability_src = me
             demon = new_state.players[demon_id]
-            assert not hasattr(demon, 'boffin_ability'), "Multiple Boffins? :O"
+            assert demon.boffin_ability is None, "Multiple Boffins? :O"
             demon.boffin_ability = ability
+            new_state.update_character_actors()
             yield from ability.run_setup(new_state, demon_id)
 
     def _activate_effects_impl(self, state: State, me: PlayerID):
         demon = state.players[self.target_demon]
-        assert not hasattr(demon, 'boffin_ability'), "Multiple Boffins? :O"
+        assert demon.boffin_ability is None, "Multiple Boffins? :O"
         demon.boffin_ability = self.inactive_ability
         self.inactive_ability = None
+        state.update_character_actors()
         demon.boffin_ability.maybe_activate_effects(state, self.target_demon)
 
     def _deactivate_effects_impl(self, state: State, me: PlayerID):
@@ -700,7 +712,8 @@ class Boffin(Minion):
         demon = state.players[self.target_demon]
         demon.boffin_ability.maybe_deactivate_effects(state, self.target_demon)
         self.inactive_ability = demon.boffin_ability
-        del demon.boffin_ability
+        demon.boffin_ability = None
+        state.update_character_actors()
 
     def _world_str(self, state: State) -> str:
         demon = state.players[self.target_demon]
@@ -752,7 +765,7 @@ class Cerenovus(Minion):
 
     def run_night(self, state: State, me: PlayerID) -> StateGen:
         cerenovus = state.players[me]
-        if cerenovus.is_dead and not cerenovus.vigormortised:
+        if cerenovus.is_dead and not cerenovus.character.vigormortised:
             yield state; return
         if self.is_droisoned(state, me):
             state.math_misregistration(me)
@@ -773,7 +786,7 @@ class Cerenovus(Minion):
         )
         speculatively_mad_players = set(
             player.id for player in state.players
-            if getattr(player, 'speculative_ceremad', 0)
+            if player.speculative_ceremad
         )
         players_executed_by_ST_tomorrow = set(
             ev.player for ev in state.puzzle.day_events.get(state.night + 1, [])
@@ -817,7 +830,7 @@ class Cerenovus(Minion):
     @staticmethod
     def _players_claiming_ceremad_tonight(state: State) -> set[PlayerID]:
         ext_info = state.puzzle.external_info_registry.get(
-            (Cerenovus, state.night), []
+            (Cerenovus, state.night), ()
         )
         return set(pid for _, pid in ext_info)
 
@@ -830,7 +843,7 @@ class Cerenovus(Minion):
         return not any(
             getattr(player, 'ceremad', 0)
             and player.id not in claiming_madness
-            and not getattr(player, 'speculative_ceremad', False)  # Still mad in round robin
+            and not player.speculative_ceremad  # Still mad in round robin
             and not info.behaves_evil(state, player.id)
             for player in state.players
         )
@@ -1064,7 +1077,7 @@ class DevilsAdvocate(Minion):
     def run_night(self, state: State, me: PlayerID) -> StateGen:
         self.maybe_deactivate_effects(state, me)
         da = state.players[me]
-        if da.is_dead and not da.vigormortised:
+        if da.is_dead and not da.character.vigormortised:
             yield state; return
 
         valid_choices = {
@@ -1158,6 +1171,7 @@ class Drunklike(Character):
     """
     lies_about_character_and_info: ClassVar[bool] = True
     wake_pattern: ClassVar[WakePattern] = WakePattern.MANUAL
+    wraps_abilities: ClassVar[bool] = True
 
     drunklike_character: Character | None = None
 
@@ -1173,6 +1187,8 @@ class Drunklike(Character):
         sim_state = state.fork()
         sim_player = sim_state.players[me]
         sim_character = sim_player.get_ability(Drunklike)
+        # Skipping State.change_character is fine here: the player is still
+        # marked as wrapped, so the actor index checks their ability directly
         sim_player.character = sim_character.drunklike_character
         return sim_state, sim_player.character
 
@@ -1376,7 +1392,7 @@ class EvilTwin(Minion):
         )
         i_am_evil = info.IsEvil(me)(state, me)
         all_good_twin_claims = state.puzzle.external_info_registry.get(
-            (EvilTwin, night_idx), []
+            (EvilTwin, night_idx), ()
         )
         for player_id in state.player_ids:
             # Only players of opposing alignment can be twins
@@ -1401,7 +1417,7 @@ class EvilTwin(Minion):
     ) -> StateGen:
         eviltwin = state.players[me]
         if (
-            (eviltwin.is_dead and not eviltwin.vigormortised)
+            (eviltwin.is_dead and not eviltwin.character.vigormortised)
             or (death != self.twin and death != me)  # `me` could be good
             or info.IsEvil(death)(state, me).not_false()
         ):
@@ -1828,6 +1844,7 @@ class Hermit(Outsider):
     You have all Outsider abilities. [-0 or -1 Outsider]
     """
     wake_pattern: ClassVar[WakePattern] = WakePattern.MANUAL
+    wraps_abilities: ClassVar[bool] = True
 
     outsiders: ClassVar[list[type[Character]]] | None = None
     active_abilities: list[Character] | None = None
@@ -2537,7 +2554,7 @@ class NightWatchman(Townsfolk):
             yield state; return
 
         all_pings = state.puzzle.external_info_registry.get(
-            (NightWatchman, state.night), []
+            (NightWatchman, state.night), ()
         )
         confirmed_by_good = any(
             True for ping, pid in all_pings
@@ -2554,7 +2571,7 @@ class NightWatchman(Townsfolk):
         """run_night when a lying player holds the NightWatchman ability."""
         # Check if a good player received the Ping
         all_pings = state.puzzle.external_info_registry.get(
-            (NightWatchman, state.night), []
+            (NightWatchman, state.night), ()
         )
         good_pings = [pid for ping, pid in all_pings if ping.player == me]
         if len(good_pings) > 1:
@@ -2710,6 +2727,7 @@ class Philosopher(Townsfolk):
     """
     # Wake pattern is replaced upon Character choice
     wake_pattern: ClassVar[WakePattern] = WakePattern.EACH_NIGHT
+    wraps_abilities: ClassVar[bool] = True
 
     active_ability: Character | None = None
     drunk_target: PlayerID | None = None
@@ -2927,7 +2945,7 @@ class PitHag(Minion):
 
     def run_night(self, state: State, me: PlayerID) -> StateGen:
         pithag = state.players[me]
-        if state.night == 1 or (pithag.is_dead and not pithag.vigormortised):
+        if state.night == 1 or (pithag.is_dead and not pithag.character.vigormortised):
             yield state; return
         if self.is_droisoned(state, me):
             # Cover both cases where would have failed or not
@@ -3146,7 +3164,7 @@ class Poisoner(Minion):
     def run_night(self, state: State, src: PlayerID) -> StateGen:
         """Override Reason: Create a world for every poisoning choice."""
         poisoner = state.players[src]
-        if poisoner.is_dead and not poisoner.vigormortised:
+        if poisoner.is_dead and not poisoner.character.vigormortised:
             yield state; return
         for target in state.player_ids:
             new_state = state.fork()
@@ -3791,7 +3809,7 @@ class ScarletWoman(Minion):
         )
         ability_active = info.STBool(
             living_player_count >= 5
-            and (not scarletwoman.is_dead or scarletwoman.vigormortised)  # ?
+            and (not scarletwoman.is_dead or scarletwoman.character.vigormortised)  # ?
         )
         demon_dying = info.IsCategory(dying.id, Demon)(state, scarletwoman.id)
 
@@ -4367,7 +4385,7 @@ class Widow(Minion):
     @staticmethod
     def _good_pings_heard_tonight(state: State) -> list[PlayerID]:
         all_pings = state.puzzle.external_info_registry.get(
-            (Widow, state.night), []
+            (Widow, state.night), ()
         )
         return [pid for _, pid in all_pings if not info.behaves_evil(state, pid)]
 
@@ -4459,7 +4477,7 @@ class Witch(Minion):
         witch = state.players[me]
 
         if (
-            (witch.is_dead and not witch.vigormortised)
+            (witch.is_dead and not witch.character.vigormortised)
             or sum(not p.is_dead for p in state.players) <= 3
         ):
             yield state; return
@@ -4612,9 +4630,8 @@ class Vigormortis(GenericDemon):
             state.players[target].droison(state, me)
         for minion in self.killed_minions:
             minion_char = state.players[minion].character
-            if hasattr(minion_char, 'vigormortised'):
-                del minion_char.vigormortised
-                # TODO: minion character change event should notify vigormortis.
+            minion_char.vigormortised = False
+            # TODO: minion character change event should notify vigormortis.
 
     def _world_str(self, state: State) -> str:
         names = [state.players[target].name for target in self.poisoned_tf]
@@ -4738,7 +4755,7 @@ class Xaan(Minion):
         targets (i.e., handle a Spy misregistering as a TF or not).
         """
         xaan = state.players[me]
-        if (xaan.is_dead and not xaan.vigormortised) or state.night != self.X:
+        if (xaan.is_dead and not xaan.character.vigormortised) or state.night != self.X:
             self.targets = None
             yield state
             return
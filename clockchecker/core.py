@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from collections.abc import Iterator, Iterable, Mapping
 from collections import Counter, defaultdict
-from copy import copy, deepcopy
+from copy import deepcopy
 from dataclasses import dataclass, field, fields, is_dataclass, InitVar
 import enum
-import inspect
+from functools import cached_property
 import itertools as it
 import os
-from typing import Callable, TypeAlias
+import sys
+from typing import Callable, Final, TypeAlias
 
 
 from . import characters
@@ -21,8 +22,8 @@ from .info import PlayerID, Info
 
 
 # Flags to enable features for development
-_PROFILING = os.environ.get('PROFILING', False)
-_DEBUG = os.environ.get('DEBUG', False) or _PROFILING
+_PROFILING: Final = os.environ.get('PROFILING', False)
+_DEBUG: Final = os.environ.get('DEBUG', False) or _PROFILING
 
 _PROFILING_FORK_LOCATIONS = Counter()
 _DEBUG_STATE_FORK_COUNTS = {}
@@ -34,6 +35,36 @@ _DEBUG_WORLD_KEYS = [
 
 StateGen: TypeAlias = Iterator['State']
 
+# Types that forked States share rather than copy, because their instances are
+# never mutated once built. Enums are added lazily.
+_SHARED_ON_FORK_TYPES = {
+    int, float, bool, str, type, type(None), frozenset, range
+}
+
+
+class _ActorIndex(dict):
+    """
+    Bitmasks of the players with a simple ability (see
+    Player._has_simple_ability) of each character type, keyed on every class
+    in their character's MRO. Built in full by State.update_character_actors
+    and never mutated afterwards, so forks share it. This relies on every
+    change to a simple player's character going through State.change_character
+    (or otherwise calling update_character_actors) to replace the index.
+    """
+
+_SHARED_ON_FORK_TYPES.add(_ActorIndex)
+
+
+class _CallbackIndex(dict):
+    """
+    The (tuple of) players registered for each Callback. Never mutated after
+    State.update_character_callbacks builds it, so forks share it until a
+    character change replaces it.
+    """
+
+_SHARED_ON_FORK_TYPES.add(_CallbackIndex)
+
+
 class Phase(enum.Enum):
     NIGHT = enum.auto()
     DAY = enum.auto()
@@ -90,6 +121,13 @@ class Player:
     character_history: list[str] = field(default_factory=list)
     ever_behaved_evil: bool = False
 
+    # Only set while the Boffin giving this ability is sober-and-healthy
+    boffin_ability: Character | None = None
+    # Set by the solver on players whose behaviour is being speculated about
+    speculative_evil: bool = False
+    speculative_good: bool = False
+    speculative_ceremad: bool = False
+
     def droison(self, state: State, src: PlayerID) -> None:
         self.droison_count += 1
         self.character.maybe_deactivate_effects(
@@ -119,14 +157,18 @@ class Player:
         """
         if character_t is None:
             return self.character
+        if self._has_simple_ability():
+            if isinstance(self.character, character_t):
+                return self.character
+            return None
         for ability in self.walk_ability_tree():
             if isinstance(ability, character_t):
                 return ability
 
     def walk_ability_tree(self) -> Iterator[Character]:
         yield from self.character.walk_ability_tree()
-        if (b_ability := getattr(self, 'boffin_ability', None)) is not None:
-            yield from b_ability.walk_ability_tree()
+        if self.boffin_ability is not None:
+            yield from self.boffin_ability.walk_ability_tree()
 
     def has_ability(self, character_t: type[Character]) -> bool:
         """
@@ -149,14 +191,26 @@ class Player:
             return ability
         if self.character.acts_like(character_t):
             return self.character
-        boffin_ability = getattr(self, 'boffin_ability', None)
+        boffin_ability = self.boffin_ability
         if boffin_ability is not None and boffin_ability.acts_like(character_t):
             return boffin_ability
         return None
 
     def acts_like(self, character_t: type[Character]) -> bool:
+        if self._has_simple_ability():
+            return isinstance(self.character, character_t)
         return self.get_ability_that_acts_like(character_t) is not None
 
+    def _has_simple_ability(self) -> bool:
+        """
+        Most players hold exactly one ability, in which case ability queries
+        are just an isinstance check on their character.
+        """
+        return (
+            not self.character.wraps_abilities
+            and self.boffin_ability is None
+        )
+
     def get_misreg_categories(
         self,
         state: State,
@@ -171,17 +225,15 @@ class Player:
             () if (self.droison_count or assume_droisoned)
             else self.character.misregister_categories
         )
-        # boffin_ability is only present when the Boffin is sober-and-healthy
-        if hasattr(self, 'boffin_ability'):
-            categories = tuple(set(
+        if (
+            self.boffin_ability is not None
+            and self.boffin_ability.misregister_categories
+        ):
+            categories = tuple(dict.fromkeys(
                 categories + self.boffin_ability.misregister_categories
             ))
         return categories
 
-    @property
-    def vigormortised(self):
-        return getattr(self.character, 'vigormortised', False)
-
     def lies_about_character(self, state: State, ignore_own_ability: bool = False) -> bool:
         """Player can lie about what character they are."""
         if self.id == 0 and state.puzzle.player_zero_is_you:
@@ -193,7 +245,7 @@ class Player:
                 self.character.lies_about_character_and_info
                 and not ignore_own_ability
             )
-            or getattr(self, 'speculative_ceremad', False)
+            or self.speculative_ceremad
         )
 
     def lies_about_info(self, state: State) -> bool:
@@ -205,7 +257,7 @@ class Player:
             info.behaves_evil(state, self.id)
             or self.character.lies_about_character_and_info
             or (
-                getattr(self, 'speculative_ceremad', False)
+                self.speculative_ceremad
                 # Can only lie about ping if lying about character when mad
                 and not isinstance(self.character, self.claim)
             )
@@ -253,17 +305,17 @@ class Player:
     def _world_str(self, state: State) -> str:
         """For printing nice output representations of worlds"""
         items = self.character_history + [self.character._world_str(state)]
-        if hasattr(self, 'boffin_ability'):
+        if self.boffin_ability is not None:
             boffin_repr = self.boffin_ability._world_str(state)
             items.append(f'with Boffin[{boffin_repr}]')
         if self.is_dead:
-            if getattr(self, 'vigormortised', False):
+            if self.character.vigormortised:
                 items.append('👻')
             else:
                 items.append('💀')
         if self.droison_count:
             items.append('🧪')
-        if hasattr(self, 'speculative_evil'):
+        if self.speculative_evil:
             items.append('(behaves evil)')
         return ' '.join(items)
 
@@ -271,7 +323,7 @@ class Player:
         self.character = self.claim()
 
         # Reorganise info so it can be easily used in night order
-        self.external_night_info = defaultdict(list)
+        self.external_night_info = {}
         existing_night_info = list(self.night_info.items())
         self.night_info: Mapping[tuple[int, type[Character]], info.Info] = {}
         for night, night_info in existing_night_info:
@@ -289,8 +341,9 @@ class Player:
                     self.night_info[(night, character)] = item
                 else:
                     assert isinstance(item, info.ExternalInfo)
-                    self.external_night_info[(night, character)].append(item)
-        self.external_night_info = dict(self.external_night_info)
+                    self.external_night_info.setdefault(
+                        (night, character), []
+                    ).append(item)
 
         existing_day_info = list(self.day_info.items())
         self.day_info: Mapping[tuple[int, type[Character]], info.Info] = {}
@@ -316,6 +369,10 @@ class State:
     puzzle: Puzzle
     players: list[Player]
 
+    # Set on branches that can't lead to the worlds in _DEBUG_WORLD_KEYS. A
+    # class attribute rather than a field, so normal forks don't copy it.
+    cull_branch = False
+
     def __post_init__(self):
         if _DEBUG:
             self.debug_key = ()  # The root debug key
@@ -329,18 +386,22 @@ class State:
         self.current_phase = Phase.SETUP
         self.phase_order_index = 0
         self.update_character_callbacks()
+        self.update_character_actors()
         self.initial_characters = tuple(type(p.character) for p in self.players)
         self.night, self.day = None, None
-        self.previously_alive = [True] * len(self.players)
+        self.previously_alive = (1 << len(self.players)) - 1  # Bitmask
 
-        self._math_misregistration_bounds = [0, 0]  # Setup pings incl. in N1.
-        self._math_misregisterers = set()
+        # Immutable, so forks share rather than copy them until they change.
+        self._math_misregistration_bounds = (0, 0)  # Setup pings incl. in N1.
+        self._math_misregisterers = frozenset()
         self.vortox = False  # The vortox will set this during setup
 
 
-        if not allow_duplicate_tokens_in_bag:
+        claims = [player.claim for player in self.players]
+        if not allow_duplicate_tokens_in_bag and len(set(claims)) < len(claims):
             # Reject good double claims, e.g. Drunk can't think
-            # they're an in-play role.
+            # they're an in-play role. Only worth checking who is good if
+            # some claim is actually repeated.
             good_claims = set()
             for player in self.players:
                 if (
@@ -368,10 +429,9 @@ class State:
         if _PROFILING and fork_id is None:
             record_fork_caller(self.debug_key, self.night or self.day, 1)
 
-        # deepcopy everything except the puzzle definition, which is shared
-        puzzle, self.puzzle = self.puzzle, None
-        ret = deepcopy(self)
-        self.puzzle, ret.puzzle = puzzle, puzzle
+        # Copy everything except the puzzle definition, which is shared
+        puzzle = self.puzzle
+        ret = _clone(self, {id(puzzle): puzzle})
 
         if _DEBUG:
             if fork_id is None:
@@ -392,10 +452,10 @@ class State:
         player: PlayerID,
         night: int,
     ):
-        return self.puzzle._night_info[player].get((night, character), None)
+        return self.puzzle._night_info_flat.get((player, night, character))
 
     def get_day_info(self, character: type[Character], player: PlayerID):
-        return self.puzzle._day_info[player].get((self.day, character), None)
+        return self.puzzle._day_info_flat.get((player, self.day, character))
 
     def _is_world(self, key: tuple[int] | None = None) -> bool:
         """
@@ -424,44 +484,70 @@ class State:
             print(f'S{self.debug_key}{underhang} {message}')
             _DEBUG_LOG_RECENT = self.debug_key
 
+    if not _DEBUG:
+        # Called at every branch of the search, so don't even check _is_world
+        def log(self, message: str | Callable[[], str]):
+            pass
+
     def run_next_character(self) -> StateGen:
         """Run all players who have the ability of the next character."""
-        order = (
-            self.puzzle.night_order if self.current_phase is Phase.NIGHT
-            else self.puzzle.day_order if self.current_phase is Phase.DAY
-            else self.puzzle.setup_order
-        )
-        if self.phase_order_index >= len(order):
-            yield self
-            return
-
-        character_t = order[self.phase_order_index]
+        puzzle = self.puzzle
+        if self.current_phase is Phase.NIGHT:
+            order, round_ = puzzle.night_order, self.night
+            info_steps = puzzle._night_info_steps
+            ext_registry = puzzle.external_info_registry
+        elif self.current_phase is Phase.DAY:
+            order, round_ = puzzle.day_order, self.day
+            info_steps, ext_registry = puzzle._day_info_steps, {}
+        else:
+            order, round_ = puzzle.setup_order, None
+            info_steps, ext_registry = frozenset(), {}
+
+        # Skip straight past steps where nobody acts and nothing is claimed,
+        # rather than yielding this state back out through each of them.
+        while True:
+            if self.phase_order_index >= len(order):
+                yield self
+                return
+            character_t = order[self.phase_order_index]
+            # Bitmask of player ids, so removing an actor is O(1)
+            actors = self._players_acting_like(character_t)
+            externals = ext_registry.get((character_t, round_))
+            claimed = (round_, character_t) in info_steps
+            if actors or externals or claimed:
+                break
+            self.phase_order_index += 1
         self.currently_acting_character = character_t
-        self.players_still_to_act = [
-            player.id for player in self.players
-            if player.acts_like(character_t)
-        ]
+        self.players_still_to_act = actors
 
         # Make sure no good players incorrectly claim to act as this character
-        for player in self.players:
-            ping = (
-                self.get_night_info(character_t, player.id, self.night)
-                if self.night is not None
-                else self.get_day_info(character_t, player.id)
-            )
-            if (
-                ping is not None and
-                player.id not in self.players_still_to_act
-                and not player.lies_about_info(self)
-            ):
-                self.log(f'REJECT: {player.name} claiming {character_t.__name__}')
-                return
+        if claimed:
+            for player in self.players:
+                ping = (
+                    self.get_night_info(character_t, player.id, self.night)
+                    if self.night is not None
+                    else self.get_day_info(character_t, player.id)
+                )
+                if (
+                    ping is not None and
+                    not actors & (1 << player.id)
+                    and not player.lies_about_info(self)
+                ):
+                    self.log(
+                        f'REJECT: {player.name} claiming {character_t.__name__}'
+                    )
+                    return
 
-        states = self.run_all_players_with_currently_acting_character()
-        if self.current_phase is Phase.NIGHT:
-            states = State.run_external_night_info(
-                states, self.currently_acting_character, self.night
-            )
+        if actors & (actors - 1):
+            states = self.run_all_players_with_currently_acting_character()
+        elif actors:
+            # A lone actor, the usual case. Actors are only ever removed from
+            # players_still_to_act, so there is no stack to drive.
+            states = self._run_next_player_with_acting_character()
+        else:
+            states = (self,)
+        if externals:
+            states = State.run_external_night_info(states, externals)
         for state in states:
             state.phase_order_index += 1
             yield state
@@ -471,11 +557,24 @@ class State:
         Multiple characters might have the ability of the character acting in
         the current night/day/setup order step, run them all.
         """
-        if not self.players_still_to_act:
-            yield self
-            return
+        # Depth-first search driven by an explicit stack of generators rather
+        # than recursion, so simultaneous actors don't set up a variable-depth
+        # generator stack. Each state carries its own players_still_to_act,
+        # which handles players changing character mid-turn.
+        stack = [iter((self,))]
+        while stack:
+            state = next(stack[-1], None)
+            if state is None:
+                stack.pop()
+            elif state.players_still_to_act:
+                stack.append(state._run_next_player_with_acting_character())
+            else:
+                yield state
 
-        pid = self.players_still_to_act.pop()
+    def _run_next_player_with_acting_character(self) -> StateGen:
+        """Run the highest-id player still to act in this order step."""
+        pid = self.players_still_to_act.bit_length() - 1
+        self.players_still_to_act &= ~(1 << pid)
         player = self.players[pid]
         ability = player.get_ability_that_acts_like(
             self.currently_acting_character
@@ -487,17 +586,18 @@ class State:
                 "feel free to remove this error and continue recursing."
             )
 
-        # Some telemetry that is nice to see when debug mode is enabled
-        round_ = self.night if self.night else self.day if self.day else ''
-        claim = (
-            '' if player.claim is self.currently_acting_character
-            else f' claiming {player.claim.__name__}'
-        )
-        self.log(
-            f'[{self.current_phase.name} {round_} '
-            f'{self.currently_acting_character.__name__}] for {player.name} (the '
-            f'{type(player.character).__name__}{claim})'
-        )
+        if _DEBUG:
+            # Some telemetry that is nice to see when debug mode is enabled
+            round_ = self.night if self.night else self.day if self.day else ''
+            claim = (
+                '' if player.claim is self.currently_acting_character
+                else f' claiming {player.claim.__name__}'
+            )
+            self.log(
+                f'[{self.current_phase.name} {round_} '
+                f'{self.currently_acting_character.__name__}] for {player.name} '
+                f'(the {type(player.character).__name__}{claim})'
+            )
 
         match self.current_phase:
             case Phase.NIGHT:
@@ -508,29 +608,19 @@ class State:
                 states = ability.run_day(self, pid)
             case Phase.SETUP:
                 states = ability.run_setup(self, pid)
-
-        # Recursive tail-calls can set up a variable-depth generator stack
-        # corresponding to how many players have the active ability, and
-        # handle players changing character mid-turn.
-        yield from apply_all(
-            states,
-            lambda s: s.run_all_players_with_currently_acting_character()
-        )
+        return states
 
     @staticmethod
     def run_external_night_info(
         states: StateGen,
-        character: type[Character],
-        night: int,
+        externals: tuple[tuple[info.ExternalInfo, PlayerID], ...],
     ) -> StateGen:
         """
         Check all information caused by this player's ability but reported by
-        another player (e.g. Nightwatchman, Evil Twin).
+        another player (e.g. Nightwatchman, Evil Twin). The externals are the
+        puzzle's external_info_registry entry for the current order step.
         """
         for state in states:
-            externals = state.puzzle.external_info_registry.get(
-                (character, night), []
-            )
             for external_info, player_id in externals:
                 if not state.players[player_id].character.run_night_external(
                     state, external_info, player_id
@@ -545,8 +635,7 @@ class State:
             yield self
         else:
             self.log(lambda: info.pretty_print(
-                events[event],
-                {p: player.name for p, player in enumerate(self.players)}
+                events[event], self.puzzle.player_names
             ))
             yield from events[event](self)
 
@@ -578,36 +667,38 @@ class State:
         states = [self]
         for pid in self.player_ids:
             states = apply_all(states, end_character_nights, pid=pid)
-        states = apply_all(states, lambda state: state._end_night())
-        yield from states
+        for state in states:
+            if state._end_night():
+                yield state
 
-    def _end_night(self) -> StateGen:
+    def _end_night(self) -> bool:
         for char_t in self.puzzle.script:
             if not char_t.global_end_night(self):
-                return
+                return False
         for player in self.players:
             player.woke_tonight = False
 
         # Check the right people have Died / Resurrected in the night
-        currently_alive = [
-            info.IsAlive(player)(self, None).is_true()
-            for player in range(len(self.players))
-        ]
-        currently_alive_gt = copy(self.previously_alive)
+        currently_alive = self._alive_mask()
+        currently_alive_gt = self.previously_alive
         if self.night in self.puzzle.night_deaths:
             for death in self.puzzle.night_deaths[self.night]:
                 # `death` can either be a NightDeath or a NightResurrection
                 # Deaths/Resurrections require players to be alive/dead resp.
+                bit = 1 << death.player
                 previously_alive_gt = isinstance(death, events.NightDeath)
-                if self.previously_alive[death.player] != previously_alive_gt:
-                    return
-                currently_alive_gt[death.player] = not previously_alive_gt
+                if bool(self.previously_alive & bit) != previously_alive_gt:
+                    return False
+                if previously_alive_gt:
+                    currently_alive_gt &= ~bit
+                else:
+                    currently_alive_gt |= bit
         if currently_alive != currently_alive_gt:
             self.log(
                 f'REJECT: Incorrect night deaths, currently_living='
-                f'{[int(x) for x in currently_alive]}'
+                f'{[currently_alive >> p & 1 for p in self.player_ids]}'
             )
-            return
+            return False
         del self.previously_alive
 
         # Check good players are what they claim to be. Update claim if changed.
@@ -617,11 +708,11 @@ class State:
                 not isinstance(player.character, player.claim)
                 and not player.lies_about_character(self)
             ):
-                return
+                return False
 
-        new_misreg = getattr(self, 'tomorrow_math_misreg_players', set())
+        new_misreg = getattr(self, 'tomorrow_math_misreg_players', frozenset())
         count = len(new_misreg)
-        self._math_misregistration_bounds = [count, count]
+        self._math_misregistration_bounds = (count, count)
         self._math_misregisterers = new_misreg
         if count:
             del self.tomorrow_math_misreg_players
@@ -631,7 +722,7 @@ class State:
         self.phase_order_index = 0
         self.day = self.night
         self.night = None
-        yield self
+        return True
 
     def end_day(self) -> StateGen:
         def end_character_days(state, pid):
@@ -640,19 +731,30 @@ class State:
         states = [self]
         for pid in self.player_ids:
             states = apply_all(states, end_character_days, pid=pid)
-        states = apply_all(states, lambda state: state._end_day())
-        yield from states
+        for state in states:
+            state._end_day()
+            yield state
 
-    def _end_day(self) -> StateGen:
-        self.previously_alive = [
-            info.IsAlive(player)(self, None).is_true()
-            for player in range(len(self.players))
-        ]
+    def _end_day(self) -> None:
+        self.previously_alive = self._alive_mask()
         self.current_phase = Phase.NIGHT
         self.phase_order_index = 0
         self.night = self.day + 1
         self.day = None
-        yield self
+
+    def _alive_mask(self) -> int:
+        """
+        Bitmask of the players for whom info.IsAlive is true, without building
+        an Info per player.
+        """
+        alive = 0
+        for player in self.players:
+            if player.is_dead:
+                continue
+            zombuul = player.get_ability(characters.Zombuul)
+            if zombuul is None or not zombuul.registering_dead:
+                alive |= 1 << player.id
+        return alive
 
     def change_alignment(self, pid: PlayerID, is_evil: bool) -> StateGen:
         """Change a players alignment, trigger allignment change callbacks."""
@@ -677,12 +779,12 @@ class State:
         player.character.maybe_deactivate_effects(
             self, player_id, characters.Reason.CHARACTER_CHANGE
         )
-        if player_id in self.players_still_to_act:
-            self.players_still_to_act.remove(player_id)
+        self.players_still_to_act &= ~(1 << player_id)
 
         next_night = self.night if self.night is not None else self.day + 1
         player.character = character(first_night=next_night)
         self.update_character_callbacks()
+        self.update_character_actors()
         player.change_claim_if_claimed_change_tonight(self)
 
         for substate in player.character.run_setup(self, player_id):
@@ -696,19 +798,49 @@ class State:
 
     def update_character_callbacks(self):
         """Re-gather callbacks after character changes"""
-        self.character_callbacks = {cb: [] for cb in Callbacks}
-        for callback_t, registered in self.character_callbacks.items():
-            for player in self.players:
+        self.character_callbacks = _CallbackIndex(
+            (callback_t, tuple(
+                player.id for player in self.players
                 if any(
                     hasattr(ability, callback_t.value)
                     for ability in player.walk_ability_tree()
-                ):
-                    registered.append(player.id)
+                )
+            ))
+            for callback_t in Callbacks
+        )
+
+    def update_character_actors(self):
+        """Re-index who acts like which character after abilities change."""
+        simple_actors = _ActorIndex()
+        self._wrapped_actors = 0  # Bitmask, checked individually each time
+        for player in self.players:
+            if not player._has_simple_ability():
+                self._wrapped_actors |= 1 << player.id
+                continue
+            # Equivalent to isinstance(player.character, cls) for each cls
+            for cls in type(player.character).__mro__:
+                simple_actors[cls] = simple_actors.get(cls, 0) | 1 << player.id
+        self._simple_actors = simple_actors
+
+    def _players_acting_like(self, character_t: type[Character]) -> int:
+        """Bitmask of the players who act like the given character."""
+        wrapped = self._wrapped_actors
+        actors = self._simple_actors.get(character_t, 0)
+        while wrapped:
+            pid = wrapped.bit_length() - 1
+            wrapped &= ~(1 << pid)
+            if self.players[pid].acts_like(character_t):
+                actors |= 1 << pid
+        return actors
 
     def trigger_callback(self, callback: Callback, *args)-> StateGen:
         """Trigger callback after global event."""
+        callers = self.character_callbacks[callback]
+        if not callers:  # The usual case
+            yield self
+            return
         states = [self]
-        for caller in self.character_callbacks[callback]:
+        for caller in callers:
             states = apply_all(states, lambda state, caller=caller: (
                 # TODO: should really walk ability tree here
                 getattr(state.players[caller].character, callback.value)(
@@ -720,8 +852,11 @@ class State:
     def player_upcoming_in_night_order(self, player: PlayerID) -> bool:
         assert self.current_phase is Phase.NIGHT
         char = type(self.players[player].character)
-        remaining_chars = self.puzzle.night_order[self.phase_order_index + 1:]
-        return player in self.players_still_to_act or char in remaining_chars
+        remaining_chars = self.puzzle.remaining_night_chars[self.phase_order_index]
+        return (
+            bool(self.players_still_to_act & (1 << player))
+            or char in remaining_chars
+        )
 
     def post_death_in_town(self, dead_player: PlayerID) -> StateGen:
         """Called immediately after a player dies."""
@@ -735,22 +870,22 @@ class State:
 
     def check_game_over(self) -> bool:
         """The game is never over, so reject games where a team has won."""
-        all_demons_dead = not any(
-            isinstance(p.character, characters.Demon) and not p.is_dead
-            for p in self.players
-        )
-        no_evil_twin = not any(
-            (
-                isinstance(p.character, characters.EvilTwin)
-                and (not p.is_dead or p.vigormortised)
+        # Single pass: any living Demon or working EvilTwin means no game over
+        Demon, EvilTwin = characters.Demon, characters.EvilTwin
+        for p in self.players:
+            character = p.character
+            if isinstance(character, Demon):
+                if not p.is_dead:
+                    return False
+            elif (
+                isinstance(character, EvilTwin)
+                and (not p.is_dead or character.vigormortised)
                 and p.droison_count == 0
-            )
-            for p in self.players
-        )
+            ):
+                return False
         # TODO: Mastermind day.
         # TODO: Evil win condition, will become relevant in Zombuul puzzles
-        game_over = all_demons_dead and no_evil_twin
-        return game_over
+        return True
 
     def math_misregistration(
         self,
@@ -765,22 +900,22 @@ class State:
         """
         if result is info.STBool.TRUE or player in self._math_misregisterers:
             return
-        self._math_misregistration_bounds[1] += 1
-        self._math_misregisterers.add(player)
+        lo, hi = self._math_misregistration_bounds
         if result is None or not result.is_maybe():
-            self._math_misregistration_bounds[0] += 1
+            lo += 1
+        self._math_misregistration_bounds = (lo, hi + 1)
+        self._math_misregisterers |= {player}
 
     def exclude_player_from_math_tonight(self, player: PlayerID):
-        self._math_misregisterers.add(player)
+        self._math_misregisterers |= {player}
 
     def math_misregistration_tomorrow(self, player: PlayerID):
         """
         Count a Mathematician misregisteration the following day, useful for
         characters where it's easier to predict than detect failures.
         """
-        players = getattr(self, 'tomorrow_math_misreg_players', set())
-        players.add(player)
-        self.tomorrow_math_misreg_players = players
+        players = getattr(self, 'tomorrow_math_misreg_players', frozenset())
+        self.tomorrow_math_misreg_players = players | {player}
 
     def __str__(self) -> str:
         ret = [f'World{self.debug_key if _DEBUG else ""}(']
@@ -852,30 +987,20 @@ class Puzzle:
             )
             collection.append(character)
 
-        self.max_day = max(
-            max(
-                max((d for d, _ in p.day_info), default=0)
-                for p in self.players
-            ),
-            max(self.day_events, default=0),
-        )
-        self.max_night = max(
-            self.max_day,
-            max((
-                max((n for n, _ in p.night_info), default=0)
-                for p in self.players
-            )),
-            max((
-                max((n for n, _ in p.external_night_info), default=0)
-                for p in self.players
-            )),
-            max(self.night_deaths, default=0),
-        )
+        self.max_day = max(self.day_events, default=0)
+        self.max_night = max(self.night_deaths, default=0)
+        for p in self.players:
+            for day, _ in p.day_info:
+                self.max_day = max(self.max_day, day)
+            for night, _ in it.chain(p.night_info, p.external_night_info):
+                self.max_night = max(self.max_night, night)
+        self.max_night = max(self.max_night, self.max_day)
         self.max_day = max(self.max_day, self.max_night - 1)
         self.finish_final_day |= (self.max_day < self.max_night)
 
         for i, player in enumerate(self.players):
             player.id = i
+        self.player_names = [player.name for player in self.players]
 
         # Make entering night deaths neater by accepting bare ints
         for night, deaths in self.night_deaths.items():
@@ -902,52 +1027,71 @@ class Puzzle:
                         self.day_events[day].insert(0, maybe_event)
                     else:
                         self.day_events[day] = [maybe_event]
-        self._night_info, self._day_info, _external_night_info = zip(*(
-            player._extract_info() for player in self.players
-        ))
+        night_infos, day_infos, _external_night_info = [], [], []
+        for player in self.players:
+            night_info, day_info, external_night_info = player._extract_info()
+            night_infos.append(night_info)
+            day_infos.append(day_info)
+            _external_night_info.append(external_night_info)
+        self._night_info, self._day_info = tuple(night_infos), tuple(day_infos)
+        # Flattened copies for State.get_night_info/get_day_info to use
+        self._night_info_flat = {
+            (pid, night, character): item
+            for pid, night_info in enumerate(self._night_info)
+            for (night, character), item in night_info.items()
+        }
+        self._day_info_flat = {
+            (pid, day, character): item
+            for pid, day_info in enumerate(self._day_info)
+            for (day, character), item in day_info.items()
+        }
+        # The (round, character) order steps that any player claims info for
+        self._night_info_steps = frozenset(k[1:] for k in self._night_info_flat)
+        self._day_info_steps = frozenset(k[1:] for k in self._day_info_flat)
         self.event_counts = defaultdict(int, {
             day: len(events) for day, events in self.day_events.items()
         })
 
         # External info retrieval
-        self.external_info_registry = defaultdict(list)
+        registry = {}
         for pid, ext_info in enumerate(_external_night_info):
             for (night, character), items in ext_info.items():
-                for item in items:
-                    self.external_info_registry[(character, night)].append(
-                        (item, pid)
-                    )
+                registry.setdefault((character, night), []).extend(
+                    (item, pid) for item in items
+                )
         self.external_info_registry: dict[
             tuple[type[Character], int],
-            tuple[info.ExternalInfo, PlayerID],
-        ] = dict(self.external_info_registry)
+            tuple[tuple[info.ExternalInfo, PlayerID], ...],
+        ] = {k: tuple(v) for k, v in registry.items()}
 
         assert self.player_zero_is_you ^ (self.players[0].name != 'You'), (
             "Player 0 must be called 'You' iff puzzle.player_zero_is_you=True"
         )
 
         # Compute script and character orderings. Sort script for determinism.
-        self.script = list(set(
+        # All tuples, as they are shared by every State and never change.
+        script = frozenset(
             [p.claim for p in self.players]
             + hidden_characters
             + self.hidden_self
             + self.also_on_script
-        ))
-        self.script.sort(key=lambda character: character.__name__)
-
-        self.setup_order = [
+        )
+        self.script = tuple(
+            sorted(script, key=lambda character: character.__name__)
+        )
+        self.setup_order = tuple(
             character for character in characters.GLOBAL_SETUP_ORDER
-            if character in self.script
-        ]
-        self.night_order = [
+            if character in script
+        )
+        self.night_order = tuple(
             character for character in characters.GLOBAL_NIGHT_ORDER
-            if character in self.script
-        ]
-        self.day_order = [
+            if character in script
+        )
+        self.day_order = tuple(
             character for character in characters.GLOBAL_DAY_ORDER
-            if character in self.script
-        ]
-        self.state_template = State(self, self.players)
+            if character in script
+        )
+        self._init_derived_state()
 
         self._validate_inputs()
 
@@ -960,9 +1104,35 @@ class Puzzle:
         }
 
     def unserialise_extra_state(self):
-        if hermit_outsiders := self._extra_serialised_state['hermit_outsiders']:
+        extra_state = self.__dict__.pop('_extra_serialised_state')
+        if hermit_outsiders := extra_state['hermit_outsiders']:
             characters.Hermit.set_outsiders(*hermit_outsiders)
-        del self._extra_serialised_state
+
+    def _init_derived_state(self):
+        """State computed from the rest of the puzzle, rebuilt on unpickling."""
+        # remaining_night_chars[i] holds the characters after night_order[i]
+        self.remaining_night_chars = [
+            frozenset(self.night_order[i + 1:])
+            for i in range(len(self.night_order) + 1)
+        ]
+
+    @cached_property
+    def state_template(self) -> State:
+        # Lazy, as unpickled copies of the puzzle attached to solutions
+        # coming back from workers never need one.
+        return State(self, self.players)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Every solution sent back from a worker carries its puzzle, so don't
+        # send anything that is cheap to recompute (see _init_derived_state).
+        del state['remaining_night_chars']
+        state.pop('state_template', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_derived_state()
 
 
     def _validate_inputs(self):
@@ -980,13 +1150,14 @@ class Puzzle:
             + self.demons + self.minions
             + self.hidden_good + self.hidden_self
         )
-        registered_characters = (
+        registered_characters = frozenset(
             characters.GLOBAL_NIGHT_ORDER
             + characters.GLOBAL_DAY_ORDER
             + characters.INACTIVE_CHARACTERS
         )
         for character in used_characters:
-            if not any(issubclass(character, r) for r in registered_characters):
+            # I.e., is the character or any of its bases registered
+            if registered_characters.isdisjoint(character.__mro__):
                 raise ValueError(
                     f'Character {character.__name__} has not been placed in the'
                     ' night order. Did you forget?'
@@ -1024,15 +1195,17 @@ class Puzzle:
 
     def __str__(self) -> str:
         ret = ['Puzzle(\n  \033[0;4mPlayers\033[0m']
-        names = [player.name for player in self.players]
+        names = self.player_names
+        external_info = defaultdict(list)
+        for (_, night), info_items in self.external_info_registry.items():
+            for info_item, pid in info_items:
+                external_info[pid].append((night, info_item))
         for player_id, player in enumerate(self.players):
             ret.append(f'    \033[33;1m{player.name} claims '
                        f'{player.claim.__name__}\033[0m')
-            for (_, night), info_items in self.external_info_registry.items():
-                for info_item, pid in info_items:
-                    if pid == player_id:
-                        info_str = info.pretty_print(info_item, names)
-                        ret.append(f'      N{night}: {info_str}')
+            for night, info_item in external_info[player_id]:
+                info_str = info.pretty_print(info_item, names)
+                ret.append(f'      N{night}: {info_str}')
             for c, all_info in (('N', self._night_info), ('D', self._day_info)):
                 for day, info_item in all_info[player_id].items():
                     if isinstance(day, tuple):
@@ -1070,12 +1243,65 @@ class Puzzle:
         return str(self)
 
 
+def _clone(value, memo: dict[int, object]):
+    """
+    Equivalent to deepcopy(value, memo), but much faster on the types that
+    actually make up a State, i.e. Players, Characters and simple containers
+    of them. Anything else falls back to deepcopy.
+    """
+    value_t = type(value)
+    if value_t in _SHARED_ON_FORK_TYPES:
+        return value
+    if value_t is tuple:
+        if all(type(x) in _SHARED_ON_FORK_TYPES for x in value):
+            return value
+        return tuple(_clone(x, memo) for x in value)
+    if (ret := memo.get(id(value))) is not None:
+        return ret
+    # Register each copy in memo before filling it in, so that containers and
+    # objects referenced from several places stay shared, as with deepcopy
+    if value_t is list:
+        memo[id(value)] = ret = []
+        ret.extend([_clone(x, memo) for x in value])
+        return ret
+    if value_t is dict:
+        memo[id(value)] = ret = {}
+        ret.update([(k, _clone(v, memo)) for k, v in value.items()])
+        return ret
+    if value_t is set:
+        # Members are hashable, so (in practice) immutable
+        memo[id(value)] = ret = set(value)
+        return ret
+    if isinstance(value, (State, Player, characters.Character)):
+        ret = value_t.__new__(value_t)
+        memo[id(value)] = ret  # Preserve any aliasing, as deepcopy would
+        ret.__dict__.update(
+            (k, _clone(v, memo)) for k, v in value.__dict__.items()
+        )
+        return ret
+    if isinstance(value, enum.Enum):
+        _SHARED_ON_FORK_TYPES.add(value_t)
+        return value
+    return deepcopy(value, memo)
+
+
 def apply_all(
     states: StateGen,
     fn: Callable[[State], StateGen],
     **kwargs,
 ) -> StateGen:
     """Yields from a state-generating function on all states in a StateGen."""
+    if not kwargs:
+        # Let chain do the delegation in C, rather than a generator frame
+        return it.chain.from_iterable(map(fn, states))
+    return _apply_all_with_kwargs(states, fn, kwargs)
+
+
+def _apply_all_with_kwargs(
+    states: StateGen,
+    fn: Callable[..., StateGen],
+    kwargs: dict,
+) -> StateGen:
     for state in states:
         yield from fn(state, **kwargs)
 
@@ -1086,13 +1312,12 @@ def record_fork_caller(debug_key: tuple[int, ...], round: int, offset: int):
     can be aggregated into stats that are useful for profiling the combinatorial
     complexity introduced by each character's implementation.
     """
-    caller_frame = inspect.currentframe().f_back
-    for _ in range(offset):
-        caller_frame = caller_frame.f_back
-    _, _, fn_name, _, _ = inspect.getframeinfo(caller_frame)
+    # Skip inspect.getframeinfo, which reads source lines off disk
+    caller_frame = sys._getframe(offset + 1)
+    fn_name = caller_frame.f_code.co_name
     cls = caller_frame.f_locals.get('self')
     cls_prefix = f'{cls.__class__.__name__}.' if cls is not None else ''
-    caller = f'{cls_prefix}{fn_name}'
+    caller = sys.intern(f'{cls_prefix}{fn_name}')  # Cheaper key comparisons
     _PROFILING_FORK_LOCATIONS[(caller, debug_key, round)] += 1
 
 
@@ -1118,20 +1343,21 @@ def summarise_fork_profiling():
         return
     wide = _PROFILING.lower() == 'wide'
     max_round = 0
-    matrix = defaultdict(lambda: defaultdict(list))  # Actually a ragged 3D tensor :)
+    # matrix[fname][round] = [total forks, number of forking calls]
+    matrix = defaultdict(lambda: defaultdict(lambda: [0, 0]))
     for (fname, _, round), count in _PROFILING_FORK_LOCATIONS.items():
-        matrix[fname][round].append(count)
+        totals = matrix[fname][round]
+        totals[0] += count
+        totals[1] += 1
         if round is not None:
             max_round = max(max_round, round)
     table = []
     rounds = [None] + list(range(1, max_round + 1))
     for fname in matrix:
-        row = [
-            ((t := sum(matrix[fname][r])), l, t / l)
-            if (l := len(matrix[fname][r]))
-            else (0, 0, 0.)
-            for r in rounds
-        ]
+        row = []
+        for r in rounds:
+            t, l = matrix[fname].get(r, (0, 0))
+            row.append((t, l, t / l) if l else (0, 0, 0.))
         t = sum(t for t, _, _ in row)
         l = sum(f for _, f, _ in row)
         table.append((fname, [(t, l, t / l)] + (row if wide else [])))
@@ -1145,7 +1371,8 @@ def summarise_fork_profiling():
         for round in rounds:
             title += f'       N{round}/D{round}       │' if round else '       Setup       │'
     w = len(title)
-    print(f'┌{'─' * (w-2)}┐\n{title}\n├{'─' * (w-2)}┤')
+    bar = '─' * (w - 2)
+    print(f'┌{bar}┐\n{title}\n├{bar}┤')
     for fname, cols in table:
         rest = ''.join(
             f' {avg:7.1f} x {count: <7} │'
@@ -1153,7 +1380,7 @@ def summarise_fork_profiling():
             for _, count, avg in cols
         )
         print(f'│ {fname: >{name_len}} │{rest}')
-    print(f'└{'─' * (w-2)}┤')
+    print(f'└{bar}┤')
     sum_msg = f'Total Forks: {sum(row[1][0][0] for row in table)}'
     print(f'{' ' * (w-len(sum_msg)-4)}│ {sum_msg} │')
     print(f'{' ' * (w-len(sum_msg)-4)}└{'─' * (len(sum_msg) + 2)}┘')
@@ -1162,7 +1389,7 @@ def _debug_keys_from_DEBUG() -> list[tuple[int, ...]]:
     if not isinstance(_DEBUG, str):
         return []
     s = _DEBUG.strip()
-    if s[0] != '(' or s[-1] != ')':
+    if not (s.startswith('(') and s.endswith(')')):  # E.g., DEBUG=1 or DEBUG=' '
         return []
     return [tuple(int(x.strip()) for x in s[1:-1].split(',') if x.strip())]
 
@@ -4,8 +4,11 @@ from collections import Counter
 from collections.abc import Iterator
 from copy import copy
 from dataclasses import dataclass
+import functools
 import itertools as it
+import math
 import os
+import pickle
 import traceback
 from typing import Callable, Sequence, Sequence, TypeAlias
 
@@ -16,7 +19,10 @@ from .characters import Character
 from .core import PlayerID, Puzzle, State, StateGen
 
 try:
-    from multiprocessing import Queue, Process
+    import multiprocessing
+    from multiprocessing import Queue
+    from multiprocessing.connection import Connection, wait
+    from multiprocessing.process import BaseProcess
     MULTIPROCESSING_AVAILABLE = True
 except ModuleNotFoundError:
     MULTIPROCESSING_AVAILABLE = False
@@ -24,10 +30,18 @@ except ModuleNotFoundError:
 
 # Option to print out each legal starting config as it's generated
 _PRINT_CONFIGS = os.environ.get('CONFIGS', False)
+# Puzzles with fewer potential starting configs than this are solved serially,
+# as starting worker processes would cost more than it saves
+_SERIAL_THRESHOLD = int(os.environ.get('SERIAL_THRESHOLD', 64))
+# Parallel solves start at most one worker per this many potential configs
+_MIN_CONFIGS_PER_WORKER = 32
+# Number of starting configs sent to a worker process per message. Kept small
+# because the work per config varies wildly, so big batches balance badly.
+_CONFIG_BATCH_SIZE = 16
 
 ConfigGen: TypeAlias = Iterator['StartingConfiguration']
 
-@dataclass
+@dataclass(slots=True)
 class StartingConfiguration:
     """
     Convenient container of everything you need (in addition to the puzzle)
@@ -63,31 +77,31 @@ def _place_hidden_characters(puzzle: Puzzle) -> ConfigGen:
         speculative_ceremad_characters
     ) = _speculative_lying_starting_characters(puzzle)
     liar_combinations = it.product(
-        it.chain(*[
-            it.combinations(puzzle.demons, i)
-            for i in range(
-                max(0, num_demons - max_speculative_ceremad - max_speculative_evil),
-                num_demons + 1,
-            )
-        ]),
-        it.chain(*[
-            it.combinations(puzzle.minions, i)
-            for i in range(num_minions, len(puzzle.minions) + 1)
-        ]),
-        it.chain(*[
-            it.combinations(puzzle.hidden_good, i)
-            for i in range(len(puzzle.hidden_good) + 1)
-        ]),
-        it.chain(*[
-            it.combinations(speculative_evil_characters, i)
-            for i in range(max_speculative_evil + 1)
-        ]),
-        it.chain(*[
-            it.combinations(speculative_ceremad_characters, i)
-            for i in range(max_speculative_ceremad + 1)
-        ])
+        _combinations_of_sizes(
+            puzzle.demons,
+            max(0, num_demons - max_speculative_ceremad - max_speculative_evil),
+            num_demons,
+        ),
+        _combinations_of_sizes(
+            puzzle.minions, num_minions, len(puzzle.minions)
+        ),
+        _combinations_of_sizes(
+            puzzle.hidden_good, 0, len(puzzle.hidden_good)
+        ),
+        _combinations_of_sizes(
+            speculative_evil_characters, 0, max_speculative_evil
+        ),
+        _combinations_of_sizes(
+            speculative_ceremad_characters, 0, max_speculative_ceremad
+        ),
     )
     player_ids = list(range(len(puzzle.players)))
+    claims = [p.claim for p in puzzle.players]
+    # Token counts don't depend on where the liars sit, only on which claims
+    # they replace, so each bag is only checked once per solve.
+    bag_is_legal = functools.cache(
+        functools.partial(_check_token_counts, puzzle, claims)
+    )
     dbg_idx = 0
     for demons, minions, hidden_good, spec_evil, spec_mad in liar_combinations:
         liars = demons + minions + hidden_good + spec_evil + spec_mad
@@ -95,30 +109,84 @@ def _place_hidden_characters(puzzle: Puzzle) -> ConfigGen:
         l, e, m = len(liars), len(spec_evil), len(spec_mad)
         if e + m > puzzle.compromises.max_speculation:
             continue
+        if (
+            not puzzle.allow_duplicate_tokens_in_bag
+            and len(set(liars)) != len(liars)
+        ):
+            continue  # Every placement of these liars would double up a token
         spec_evil_slice = slice(l - e - m, l - m)
         spec_mad_slice = slice(l - m, l)
-        for liar_pos in it.permutations(player_ids, len(liars)):
-            spec_evil_pos = liar_pos[spec_evil_slice]
-            spec_mad_pos = liar_pos[spec_mad_slice]
+        for liar_pos in it.permutations(player_ids, l):
+            in_play = claims.copy()
+            for liar, position in zip(liars, liar_pos):
+                in_play[position] = liar
+            if (
+                puzzle.player_zero_is_you
+                and in_play[0] not in puzzle.hidden_self
+                and in_play[0] is not claims[0]
+            ):
+                continue
+            if not bag_is_legal(liars, frozenset(liar_pos)):
+                continue
             config = StartingConfiguration(
                 liar_characters=liars,
                 liar_positions=liar_pos,
-                speculative_evil_positions=spec_evil_pos,
-                speculative_ceremad_positions=spec_mad_pos,
+                speculative_evil_positions=liar_pos[spec_evil_slice],
+                speculative_ceremad_positions=liar_pos[spec_mad_slice],
                 speculative_good_positions=(),
                 debug_key=(dbg_idx,),
             )
-            in_play = [p.claim for p in puzzle.players]
-            for liar, position in zip(liars, liar_pos):
-                in_play[position] = liar
-            if _check_token_counts(puzzle, in_play):
-                facts = _facts_for_speculation(puzzle, in_play)
-                for subconf in _speculate_evil_good_evil(puzzle, config, facts):
-                    if _check_speculation(puzzle, subconf, in_play, facts):
-                        if core._PROFILING:
-                            core.record_fork_caller((), None, 0)
-                        yield subconf
-                        dbg_idx += 1
+            facts = _facts_for_speculation(puzzle, in_play)
+            for subconf in _speculate_evil_good_evil(puzzle, config, facts):
+                if _check_speculation(puzzle, subconf, in_play, facts):
+                    if core._PROFILING:
+                        core.record_fork_caller((), None, 0)
+                    yield subconf
+                    dbg_idx += 1
+
+def _combinations_of_sizes(
+    items: Sequence[type[Character]] | Sequence[PlayerID],
+    min_size: int,
+    max_size: int,
+) -> Iterator[tuple]:
+    """All combinations of `items` with length in [min_size, max_size]."""
+    return it.chain.from_iterable(
+        it.combinations(items, i) for i in range(min_size, max_size + 1)
+    )
+
+def _estimate_num_configs(puzzle: Puzzle) -> int:
+    """
+    Count the hidden character placements that _place_hidden_characters will
+    try, before token count and speculation checks reject most of them. This
+    is cheap, so can be used to decide whether a puzzle is worth parallelising.
+    """
+    _, _, num_minions, num_demons = puzzle.category_counts
+    (
+        max_speculative_evil,
+        speculative_evil_characters,
+        max_speculative_ceremad,
+        speculative_ceremad_characters
+    ) = _speculative_lying_starting_characters(puzzle)
+    bands = (
+        (puzzle.demons, range(
+            max(0, num_demons - max_speculative_ceremad - max_speculative_evil),
+            num_demons + 1,
+        )),
+        (puzzle.minions, range(num_minions, len(puzzle.minions) + 1)),
+        (puzzle.hidden_good, range(len(puzzle.hidden_good) + 1)),
+        (speculative_evil_characters, range(max_speculative_evil + 1)),
+        (speculative_ceremad_characters, range(max_speculative_ceremad + 1)),
+    )
+    num_players = len(puzzle.players)
+    total = 0
+    for sizes in it.product(*(sizes for _, sizes in bands)):
+        if sizes[3] + sizes[4] > puzzle.compromises.max_speculation:
+            continue
+        num_combinations = math.prod(
+            math.comb(len(items), size) for (items, _), size in zip(bands, sizes)
+        )
+        total += num_combinations * math.perm(num_players, sum(sizes))
+    return total
 
 def _speculative_lying_starting_characters(puzzle: Puzzle) -> tuple[
     int, list[type[Character]], int, list[type[Character]],
@@ -193,10 +261,9 @@ def _speculate_evil_good_evil(
         if player not in existing_speculation
     ]
     dbg_idx = 0
-    for extra_speculation in it.chain(*[
-        it.combinations(starting_evils, i)
-        for i in range(max_extra_speculation + 1)
-    ]):
+    for extra_speculation in _combinations_of_sizes(
+        starting_evils, 0, max_extra_speculation
+    ):
         if core._PROFILING:
             core.record_fork_caller(config.debug_key, None, 0)
         new_config = copy(config)
@@ -211,15 +278,16 @@ def _speculate_evil_good_evil(
 
 def _check_token_counts(
     puzzle: Puzzle,
-    in_play: Sequence[type[Character]],
+    claims: Sequence[type[Character]],
+    liars: tuple[type[Character], ...],
+    liar_positions: frozenset[PlayerID],
 ) -> bool:
-    """Check the list of starting characters is legal."""
-    if (
-        puzzle.player_zero_is_you
-        and in_play[0] not in puzzle.hidden_self
-        and in_play[0] is not puzzle.players[0].claim
-    ):
-        return False
+    """Check the bag of starting characters is legal."""
+    in_play = [
+        claim for player, claim in enumerate(claims)
+        if player not in liar_positions
+    ]
+    in_play.extend(liars)
     T, O, M, D = puzzle.category_counts
     bounds = ((T, T), (O, O), (M, M), (D, D))
     for character in in_play:
@@ -396,22 +464,22 @@ def _world_check(puzzle: Puzzle, config: StartingConfiguration) -> StateGen:
     # SETUP
     worlds = [world]
     for _ in range(len(puzzle.setup_order)):
-        worlds = _apply_all(worlds, lambda w: w.run_next_character())
-    worlds = _apply_all(worlds, lambda w: w.end_setup())
+        worlds = _apply_all(worlds, State.run_next_character)
+    worlds = _apply_all(worlds, State.end_setup)
     for round_ in range(1, puzzle.max_night + 1):
         # NIGHT
         for _ in range(len(puzzle.night_order)):
-            worlds = _apply_all(worlds, lambda w: w.run_next_character())
-        worlds = _apply_all(worlds, lambda w: w.end_night())
+            worlds = _apply_all(worlds, State.run_next_character)
+        worlds = _apply_all(worlds, State.end_night)
         if round_ <= puzzle.max_day:
             # DAY
             for _ in range(len(puzzle.day_order)):
-                worlds = _apply_all(worlds, lambda w: w.run_next_character())
+                worlds = _apply_all(worlds, State.run_next_character)
             for event in range(puzzle.event_counts[round_]):
                 worlds = _apply_all(
                     worlds, lambda w, r=round_, e=event: w.run_event(r, e))
             if round_ < puzzle.max_day or puzzle.finish_final_day:
-                worlds = _apply_all(worlds, lambda w: w.end_day())
+                worlds = _apply_all(worlds, State.end_day)
 
     # ROUND ROBIN
     worlds = _apply_all(worlds, lambda w: _round_robin(w, config))
@@ -430,11 +498,11 @@ def _round_robin(state: State, config: StartingConfiguration) -> StateGen:
     state.log('[ROUND ROBIN]')
 
     for player in state.players:
-        if hasattr(player, 'speculative_evil'):
-            del player.speculative_evil
+        if player.speculative_evil:
+            player.speculative_evil = False
             if not info.behaves_evil(state, player.id):
                 return
-        if hasattr(player, 'speculative_ceremad'):
+        if player.speculative_ceremad:
             if (
                 not getattr(player, 'ceremad', 0)
                 # Players mad as their own character aren't free to lie (retro)
@@ -442,7 +510,7 @@ def _round_robin(state: State, config: StartingConfiguration) -> StateGen:
             ):
                 return
 
-    if not any(hasattr(p, 'speculative_good') for p in state.players):
+    if not any(p.speculative_good for p in state.players):
         speculative_good = [
             pid
             for pid, player in enumerate(state.players)
@@ -476,73 +544,177 @@ def _world_check_gen(
         yield from _world_check(puzzle, config)
 
 
+def _make_solution_filter(puzzle: Puzzle) -> Callable[[State], bool]:
+    """
+    Make a predicate accepting the solutions that should be reported, e.g.,
+    deduplicating by identical starting characters.
+    """
+    if not puzzle.deduplicate_initial_characters:
+        return lambda solution: True
+
+    seen_solutions = set()
+    def accept(solution: State) -> bool:
+        key = solution.initial_characters + tuple(
+            type(p.character) for p in solution.players
+        )
+        if key in seen_solutions:
+            return False
+        seen_solutions.add(key)
+        return True
+    return accept
+
+
+def _atheist_solutions(puzzle: Puzzle) -> StateGen:
+    """If no world is possible, the Storyteller may be breaking the rules."""
+    atheist_state = puzzle.state_template.fork(fork_id=(-1,))
+    atheist_state.begin_game(True)
+    if any(p.has_ability(characters.Atheist) for p in atheist_state.players):
+        yield atheist_state
+
+
 def _filter_solutions(puzzle: Puzzle, solutions: StateGen) -> StateGen:
     """
     Filter solutions, e.g., deduplicating by identical starting characters.
     """
     any_solution_found = False
+    for solution in filter(_make_solution_filter(puzzle), solutions):
+        yield solution
+        any_solution_found = True
 
-    if puzzle.deduplicate_initial_characters:
-        seen_solutions = set()
-        for solution in solutions:
-            key = solution.initial_characters + tuple(
-                type(p.character) for p in solution.players
-            )
-            if key not in seen_solutions:
-                seen_solutions.add(key)
+    if not any_solution_found:
+        yield from _atheist_solutions(puzzle)
+
+
+def _solve_serial(puzzle: Puzzle) -> StateGen:
+    """
+    Equivalent to chaining _place_hidden_characters, _world_check_gen and
+    _filter_solutions, but as a single loop, to avoid resuming a stack of
+    generators for every item.
+    """
+    if core._DEBUG:
+        core._DEBUG_STATE_FORK_COUNTS.clear()
+    if core._PROFILING:
+        core._PROFILING_FORK_LOCATIONS.clear()
+
+    accept = _make_solution_filter(puzzle)
+    any_solution_found = False
+    for config in _place_hidden_characters(puzzle):
+        for solution in _world_check(puzzle, config):
+            if accept(solution):
                 yield solution
-        any_solution_found = bool(seen_solutions)
-    else:
-        for solution in solutions:
-            yield solution
-            any_solution_found = True
+                any_solution_found = True
 
     if not any_solution_found:
-        atheist_state = puzzle.state_template.fork(fork_id=(-1,))
-        atheist_state.begin_game(True)
-        if any(p.has_ability(characters.Atheist) for p in atheist_state.players):
-            yield atheist_state
+        yield from _atheist_solutions(puzzle)
 
 
 # ------------------------------ THREADING ------------------------------ #
 
-def _world_checking_worker(puzzle: Puzzle, config_q: Queue, solutions_q: Queue):
+def _mp_context() -> 'multiprocessing.context.BaseContext':
+    """
+    Use the start method the caller has set, if any. Otherwise, fork is the
+    cheapest way to start workers where it is the default. Other platforms
+    default to spawn, which boots a fresh interpreter and reimports
+    clockchecker per worker, so there fork workers from a server process that
+    has already done the import. Contexts are requested by name so that the
+    process-wide default start method is never locked in from here.
+    """
+    if (method := multiprocessing.get_start_method(allow_none=True)):
+        return multiprocessing.get_context(method)
+    all_methods = multiprocessing.get_all_start_methods()
+    if all_methods[0] == 'fork':  # The first is the platform default
+        return multiprocessing.get_context('fork')
+    if 'forkserver' in all_methods:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['clockchecker'])
+        return context
+    return multiprocessing.get_context(all_methods[0])
+
+def _world_checking_worker(
+    puzzle_bytes: bytes,
+    config_q: Queue,
+    solutions_conn: Connection,
+):
+    puzzle = pickle.loads(puzzle_bytes)
     puzzle.unserialise_extra_state()
     def liars_gen():
-        while (liars := config_q.get()) is not None:
-            yield liars
+        while (config_batch := config_q.get()) is not None:
+            yield from config_batch
+    # Drop duplicates before paying to send them. The parent still filters
+    # again, since different workers can find the same solution.
+    accept = _make_solution_filter(puzzle)
     try:
         for solution in _world_check_gen(puzzle, liars_gen()):
-            solutions_q.put(solution)
+            if accept(solution):
+                solutions_conn.send(solution)
     except Exception as e:
-        solutions_q.put(traceback.format_exc())
+        solutions_conn.send(traceback.format_exc())
     if core._PROFILING:
-        solutions_q.put(core._PROFILING_FORK_LOCATIONS)
-    solutions_q.put(None)  # Finished Sentinel
+        solutions_conn.send(core._PROFILING_FORK_LOCATIONS)
 
-def _starting_config_worker(puzzle: Puzzle, config_q: Queue, num_procs: int):
-    for config in  _place_hidden_characters(puzzle):
-        config_q.put(config)
+def _starting_config_worker(
+    puzzle_bytes: bytes, config_q: Queue, num_procs: int
+):
+    puzzle = pickle.loads(puzzle_bytes)
+    puzzle.unserialise_extra_state()
+    # Send configs in batches to amortise the per-message pickling and locking
+    configs = _place_hidden_characters(puzzle)
+    while config_batch := list(it.islice(configs, _CONFIG_BATCH_SIZE)):
+        config_q.put(config_batch)
     for _ in range(num_procs):
         config_q.put(None)  # Finished Sentinel
     if core._PROFILING:
         config_q.put(core._PROFILING_FORK_LOCATIONS)
 
-def _solution_collecting_worker(solutions_q: Queue, num_procs: int) -> StateGen:
-    finish_count = 0
+def _receive(conn: Connection, drain: bool) -> Iterator:
+    """
+    Receive the next message from conn or, if drain, all remaining messages.
+    Closes conn once it has been drained or the sending end has hung up.
+    """
+    try:
+        if not drain:
+            yield conn.recv()
+            return
+        while not conn.closed and conn.poll():
+            yield conn.recv()
+    except EOFError:
+        pass
+    conn.close()
+
+def _solution_collecting_worker(
+    workers: list[tuple[BaseProcess, Connection]],
+) -> StateGen:
+    # Each worker has its own pipe, so workers never contend with each other
+    # to send, and we just service whichever pipes have data ready. Rather than
+    # waiting for finished sentinels, we also wait on each worker's process:
+    # once it has exited, everything it sent is already sitting in its pipe.
+    workers_by_sentinel = {
+        worker.sentinel: (worker, conn) for worker, conn in workers
+    }
+    waiting_on = [conn for _, conn in workers] + list(workers_by_sentinel)
     err_str = None
-    while True:
-        recvd = solutions_q.get()
-        if isinstance(recvd, State):
-            yield recvd
-        elif isinstance(recvd, Counter) and core._PROFILING:
-            core._PROFILING_FORK_LOCATIONS += recvd
-        else:  # Finished. Maybe sentinel, maybe error
-            if recvd is not None:
-                err_str = recvd
-            finish_count += 1
-            if finish_count == num_procs:
-                break
+    while waiting_on:
+        for ready in wait(waiting_on):
+            if ready not in waiting_on:
+                continue  # Retired earlier in this batch
+            if ready in workers_by_sentinel:
+                worker, conn = workers_by_sentinel[ready]
+                waiting_on.remove(ready)
+                worker.join()  # Already exited, this just reaps the exit code
+                if worker.exitcode != 0:
+                    err_str = f'Worker exited with code {worker.exitcode}'
+                drain = True
+            else:
+                conn, drain = ready, False
+            for recvd in _receive(conn, drain):
+                if isinstance(recvd, State):
+                    yield recvd
+                elif isinstance(recvd, Counter) and core._PROFILING:
+                    core._PROFILING_FORK_LOCATIONS += recvd
+                else:  # Traceback of an error in the worker
+                    err_str = recvd
+            if conn.closed and conn in waiting_on:
+                waiting_on.remove(conn)
     if err_str is not None:
         exc = RuntimeError('Exception during solve, see below')
         exc.add_note(f'\n{err_str}')
@@ -555,44 +727,90 @@ def solve(puzzle: Puzzle, num_processes=None) -> StateGen:
     if num_processes is None:
         num_processes = int(os.environ.get('NUM_PROC', os.cpu_count()))
 
+    if num_processes > 1 and MULTIPROCESSING_AVAILABLE:
+        num_configs = _estimate_num_configs(puzzle)
+        if num_configs < _SERIAL_THRESHOLD:
+            if core._DEBUG:
+                print(f'Only {num_configs} potential configs, solving serially')
+            num_processes = 1
+        else:
+            # Don't start workers that would have nothing to do
+            num_processes = max(1, min(
+                num_processes, num_configs // _MIN_CONFIGS_PER_WORKER
+            ))
+
     if num_processes == 1 or not MULTIPROCESSING_AVAILABLE:
         # Non-parallel version just runs everything in one process.
-        configs = _place_hidden_characters(puzzle)
-        solutions = _world_check_gen(puzzle, configs)
-        solutions = _filter_solutions(puzzle, solutions)
-        yield from solutions
+        yield from _solve_serial(puzzle)
     else:
         # Parallel version
-        config_queue = Queue(maxsize=num_processes)
-        solutions_queue = Queue(maxsize=num_processes)
+        mp_context = _mp_context()
+        # Let the producer run well ahead, so workers that get through a run of
+        # cheap configs don't stall waiting for more. Configs are small.
+        config_queue = mp_context.Queue(maxsize=max(num_processes * 4, 64))
+        # Solutions are large and there is a single reader, so skip Queue's
+        # feeder thread and give each worker a pipe straight to the parent,
+        # which also provides back-pressure. Duplex pipes are AF_UNIX socket
+        # pairs on posix, which buffer more than an os.pipe before a sending
+        # worker has to block. We only use the (receive, send) direction.
+        solutions_pipes = [mp_context.Pipe() for _ in range(num_processes)]
+        # The interrupt hook is often a closure, which can't be pickled, and
+        # only the parent process is ever interrupted anyway.
+        worker_puzzle = copy(puzzle)
+        worker_puzzle.user_interrupt = None
+        # Pickle the puzzle once up front rather than once per worker
+        puzzle_bytes = pickle.dumps(
+            worker_puzzle, protocol=pickle.HIGHEST_PROTOCOL
+        )
 
-        all_workers = [
-            Process(
+        checking_workers = [
+            mp_context.Process(
                 target=_world_checking_worker,
                 daemon=True,
-                args=(puzzle, config_queue, solutions_queue)
+                args=(puzzle_bytes, config_queue, send_conn),
             )
-            for _ in range(num_processes)
+            for _, send_conn in solutions_pipes
         ]
-        all_workers.append(
-            Process(
+        # Start the config producer first, so configs are already queued up by
+        # the time the world-checking workers have finished starting
+        all_workers = [
+            mp_context.Process(
                 target=_starting_config_worker,
                 daemon=True,
-                args=(puzzle, config_queue, num_processes)
+                args=(puzzle_bytes, config_queue, num_processes)
             )
-        )
+        ] + checking_workers
 
-        for worker in all_workers:
-            worker.start()
+        try:
+            for worker in all_workers:
+                worker.start()
+            for _, send_conn in solutions_pipes:
+                send_conn.close()  # Only the workers send
 
-        solutions = _solution_collecting_worker(solutions_queue, num_processes)
-        yield from _filter_solutions(puzzle, solutions)
+            solutions = _solution_collecting_worker([
+                (worker, recv_conn) for worker, (recv_conn, _)
+                in zip(checking_workers, solutions_pipes)
+            ])
+            yield from _filter_solutions(puzzle, solutions)
 
-        for worker in all_workers:
-            worker.join()
+            for worker in all_workers:
+                worker.join()
 
-        if core._PROFILING:
-            core._PROFILING_FORK_LOCATIONS += config_queue.get()
+            if core._PROFILING:
+                core._PROFILING_FORK_LOCATIONS += config_queue.get()
+        finally:
+            # Workers are still running only if the caller stopped consuming
+            # solutions early or the solve failed, so their results aren't wanted.
+            # Shut them down now rather than leaving them to run to completion
+            # (daemon=True remains as a backstop for if this never runs, e.g.
+            # the caller abandons the generator without closing it).
+            for worker in all_workers:
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+            for recv_conn, _ in solutions_pipes:
+                recv_conn.close()
+            config_queue.close()
 
     core.summarise_fork_profiling()
 
@@ -610,6 +828,6 @@ def _apply_all(states: StateGen, fn: Callable[[State], StateGen]) -> StateGen:
     Utility for calling a state-generating function on all states in a StateGen.
     """
     for state in states:
-        if hasattr(state, 'cull_branch'):
+        if state.cull_branch:
             continue
         yield from fn(state)
@@ -3186,6 +3186,29 @@ class TestTeaLady(unittest.TestCase):
         ))
 
 
+class TestFork(unittest.TestCase):
+    def test_fork_preserves_shared_containers(self):
+        state = puzzles.puzzle_NQT1().puzzle.state_template.fork()
+        shared = [[], {}, set()]
+        state.players[0].shared = shared
+        state.players[1].shared = shared
+        state.players[1].also_shared = shared[0]
+
+        forked = state.fork()
+        self.assertIsNot(forked.players[0].shared, shared)
+        self.assertIs(forked.players[0].shared, forked.players[1].shared)
+        self.assertIs(
+            forked.players[1].also_shared, forked.players[1].shared[0]
+        )
+
+
+class TestPuzzleCopy(unittest.TestCase):
+    def test_deepcopy_keeps_user_interrupt(self):
+        puzzle = puzzles.puzzle_NQT1().puzzle
+        puzzle.user_interrupt = lambda: False
+        self.assertIs(deepcopy(puzzle).user_interrupt, puzzle.user_interrupt)
+
+
 # Test:
 # Test Evil Courtier
 # Test SnakeCharmer. Also, test demon claims to have been charmed.